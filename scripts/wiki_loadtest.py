@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Load generator for the wiki blueprint.
+
+Builds the application in-process from its factory, against the database in its
+configuration, and drives the wiki routes with a mix of article reads and
+edits/creations from several processes, each running several threads. Reports
+throughput, latency percentiles and error counts per operation:
+
+    ./scripts/wiki_loadtest.py --app core:create_app --config config.py \\
+        --processes 4 --threads 16 --duration 30 --write-ratio 0.05
+
+Requests go through each thread's own test client, so no server or API key is
+needed; they are made as ``--user-id``, which must hold the wiki permissions.
+Database exceptions propagate to the harness, so alias races (two creations
+passing the alias check before either inserts) and revision id conflicts (two
+edits computing the same next revision id) are told apart by the violated
+constraint, ``wiki_aliases_pkey`` or ``wiki_revisions_pkey``.
+
+Reads are skewed towards the first of ``--article-ids``, so that a handful of
+popular articles see most of the traffic, like they do in production.
+"""
+import argparse
+import importlib
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import flask
+from sqlalchemy.exc import IntegrityError
+
+# (operation, latency in seconds, error kind or None)
+Result = Tuple[str, float, Optional[str]]
+
+CONSTRAINT_ERRORS = {
+    'wiki_aliases_pkey': 'alias_conflict',
+    'wiki_revisions_pkey': 'revision_conflict',
+}
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument(
+        '--app',
+        default='core:create_app',
+        help='Application factory, as module:callable.',
+    )
+    parser.add_argument(
+        '--config', default='config.py', help='Passed to the factory.'
+    )
+    parser.add_argument(
+        '--user-id', type=int, default=1, help='User to make requests as.'
+    )
+    parser.add_argument('--processes', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument(
+        '--duration', type=float, default=10, help='Seconds to run for.'
+    )
+    parser.add_argument(
+        '--write-ratio',
+        type=float,
+        default=0.05,
+        help='Fraction of requests which are writes.',
+    )
+    parser.add_argument(
+        '--create-ratio',
+        type=float,
+        default=0.2,
+        help='Fraction of writes which create articles rather than edit them.',
+    )
+    parser.add_argument(
+        '--article-ids',
+        type=lambda s: [int(i) for i in s.split(',')],
+        default=[1, 2, 3],
+        help='Comma separated articles to read and edit, most popular first.',
+    )
+    parser.add_argument('--language', default='en')
+    parser.add_argument(
+        '--shared-titles',
+        action='store_true',
+        help='Create articles from a small shared pool of titles to provoke '
+        'alias races.',
+    )
+    args = parser.parse_args(argv)
+    # Keeps created titles from clashing with those of previous runs.
+    args.run_id = uuid.uuid4().hex[:8]
+    return args
+
+
+def make_app(args: argparse.Namespace) -> flask.Flask:
+    module, _, factory = args.app.partition(':')
+    app = getattr(importlib.import_module(module), factory)(args.config)
+    app.config['PROPAGATE_EXCEPTIONS'] = True
+
+    from core.users.models import User
+
+    # Registered after the application's own hooks, so it runs after them.
+    @app.before_request
+    def act_as_user():
+        flask.g.user = User.from_pk(args.user_id)
+
+    return app
+
+
+def classify_response(response: flask.Response) -> Optional[str]:
+    if response.status_code < 400:
+        return None
+    if b'has already been taken' in response.get_data():
+        return 'alias_taken'
+    return f'http_{response.status_code}'
+
+
+def classify_exception(exc: Exception) -> str:
+    if isinstance(exc, IntegrityError):
+        constraint = getattr(
+            getattr(exc.orig, 'diag', None), 'constraint_name', None
+        )
+        return CONSTRAINT_ERRORS.get(constraint, 'integrity_error')
+    return 'server_error'
+
+
+def request(
+    client, method: str, path: str, data: Optional[dict] = None
+) -> Tuple[float, Optional[str]]:
+    start = time.perf_counter()
+    try:
+        error = classify_response(client.open(path, method=method, json=data))
+    except Exception as e:
+        error = classify_exception(e)
+    return time.perf_counter() - start, error
+
+
+def run_thread(
+    args: argparse.Namespace, app: flask.Flask, seed: int
+) -> List[Result]:
+    client = app.test_client()
+    rand = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(args.article_ids) + 1)]
+    results: List[Result] = []
+    deadline = time.monotonic() + args.duration
+    while time.monotonic() < deadline:
+        article_id = rand.choices(args.article_ids, weights)[0]
+        if rand.random() >= args.write_ratio:
+            op = 'read'
+            latency, error = request(
+                client, 'GET', f'/wiki/articles/{article_id}'
+            )
+        elif rand.random() < args.create_ratio:
+            op = 'create'
+            if args.shared_titles:
+                title = f'loadtest {args.run_id} {rand.randrange(10)}'
+            else:
+                title = f'loadtest {args.run_id} {seed} {len(results)}'
+            latency, error = request(
+                client,
+                'POST',
+                '/wiki/create',
+                {'title': title, 'contents': f'Created by {seed}.'},
+            )
+        else:
+            op = 'modify'
+            latency, error = request(
+                client,
+                'PUT',
+                f'/wiki/modify/{article_id}',
+                {
+                    'title': f'loadtest {args.run_id} {article_id}',
+                    'language': args.language,
+                    'contents': f'Edited by {seed} at {time.time()}.',
+                },
+            )
+        results.append((op, latency, error))
+    return results
+
+
+def run_process(args: argparse.Namespace, process: int) -> List[Result]:
+    app = make_app(args)
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        futures = [
+            executor.submit(run_thread, args, app, process * args.threads + t)
+            for t in range(args.threads)
+        ]
+        return [r for f in futures for r in f.result()]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+
+def report(results: List[Result], elapsed: float) -> None:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, Counter] = defaultdict(Counter)
+    for op, latency, error in results:
+        latencies[op].append(latency)
+        if error:
+            errors[op][error] += 1
+
+    print(
+        f'{len(results)} requests in {elapsed:.1f}s '
+        f'({len(results) / elapsed:.1f} req/s)'
+    )
+    print(
+        f'{"op":<8}{"count":>8}{"req/s":>9}{"p50 ms":>9}{"p90 ms":>9}'
+        f'{"p99 ms":>9}{"max ms":>9}  errors'
+    )
+    for op in sorted(latencies):
+        values = sorted(latencies[op])
+        error_str = ', '.join(
+            f'{k}={v}' for k, v in sorted(errors[op].items())
+        )
+        print(
+            f'{op:<8}{len(values):>8}{len(values) / elapsed:>9.1f}'
+            + ''.join(
+                f'{percentile(values, p) * 1000:>9.1f}' for p in (50, 90, 99)
+            )
+            + f'{values[-1] * 1000:>9.1f}  {error_str or "-"}'
+        )
+
+
+def main(argv: List[str]) -> None:
+    args = parse_args(argv)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.processes) as executor:
+        futures = [
+            executor.submit(run_process, args, p)
+            for p in range(args.processes)
+        ]
+        results = [r for f in futures for r in f.result()]
+    report(results, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
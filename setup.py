@@ -36,6 +36,7 @@ setup(
     url='https://github.com/sharebears/pulsar-wiki',
     packages=['wiki'],
     python_requires='>=3.7, <3.8',
+    extras_require={'brotli': ['brotli'], 'msgpack': ['msgpack']},
     tests_require=['pytest', 'mock'],
     cmdclass={'test': PyTest},
 )
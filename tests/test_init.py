@@ -0,0 +1,27 @@
+import sys
+
+import flask
+
+import wiki
+
+
+def test_init_startup_timings(app):
+    timings = app.extensions['plugin_startup']['wiki']
+    assert set(timings) == set(wiki.MODULES) | {'total'}
+    assert all(t >= 0 for t in timings.values())
+    assert timings['total'] >= sum(timings[n] for n in wiki.MODULES)
+
+
+def test_init_registers_routes(app):
+    rules = {r.rule for r in app.url_map.iter_rules()}
+    assert '/wiki/articles/<int:id>' in rules
+    assert '/wiki/autocomplete' in rules
+    assert '/wiki/articles/<int:id>/backlinks' in rules
+
+
+def test_init_does_not_import_test_data(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'wiki.test_data', raising=False)
+    app = flask.Flask(__name__)
+    wiki.init_app(app)
+    assert 'wiki.test_data' not in sys.modules
+    assert 'wiki' in app.extensions['plugin_startup']
@@ -7,6 +7,7 @@ from wiki.models import (
     WikiAlias,
     WikiArticle,
     WikiLanguage,
+    WikiLink,
     WikiRevision,
     WikiTranslation,
 )
@@ -40,6 +41,20 @@ def test_get_all_articles_include_dead(client):
     assert len(articles) == 4
 
 
+def test_get_all_articles_live_and_dead_cached_separately(client):
+    assert len(WikiArticle.get_all()) == 3
+    assert len(WikiArticle.get_all(include_dead=True)) == 4
+    assert len(WikiArticle.get_all()) == 3
+
+
+def test_new_article_clears_both_listings(client):
+    WikiArticle.get_all()
+    WikiArticle.get_all(include_dead=True)
+    WikiArticle.new(title='new article', contents='contents', user_id=1)
+    assert len(WikiArticle.get_all()) == 4
+    assert len(WikiArticle.get_all(include_dead=True)) == 5
+
+
 def test_new_wiki_article(client):
     article = WikiArticle.new(
         title='new article', contents='new article contents', user_id=1
@@ -154,3 +169,87 @@ def test_serialize_revision(authed_client):
     assert data['title'] == 'Wiki1'
     assert data['language']['id'] == 1
     assert data['parent_article']['id'] == 1
+
+
+def test_alias_from_prefix(client):
+    aliases = WikiAlias.from_prefix('Wiki')
+    assert [a.alias for a in aliases] == [
+        'wiki1',
+        'wiki2',
+        'wiki3',
+        'wikidos',
+        'wikione',
+        'wikiuno',
+    ]
+    assert aliases[0].article_id == 1
+
+
+def test_alias_from_prefix_limit(client):
+    aliases = WikiAlias.from_prefix('wiki', limit=2)
+    assert [a.alias for a in aliases] == ['wiki1', 'wiki2']
+
+
+def test_alias_from_prefix_excludes_deleted_articles(client):
+    assert WikiAlias.from_prefix('wiki4') == []
+
+
+def test_alias_from_prefix_escapes_wildcards(client):
+    assert WikiAlias.from_prefix('w_ki') == []
+    assert WikiAlias.from_prefix('%') == []
+
+
+def test_link_extract_targets():
+    assert WikiLink.extract_targets(
+        'See [[Wiki 1]], [[wiki1|the first]] and [[Other Page]]. [[]]'
+    ) == ['wiki1', 'otherpage']
+
+
+def test_backlinks(client):
+    assert WikiLink.backlinks(1) == [{'id': 2, 'title': 'Wiki2'}]
+    assert WikiLink.backlinks(3) == []
+
+
+def test_backlinks_paginated(client):
+    WikiArticle.new(title='Linker', contents='[[Wiki 1]]', user_id=1)
+    assert [a['id'] for a in WikiLink.backlinks(1, limit=1)] == [2]
+    assert [a['id'] for a in WikiLink.backlinks(1, page=2, limit=1)] == [5]
+
+
+def test_broken_links(client):
+    links = WikiLink.get_broken()
+    assert len(links) == 1
+    assert links[0].target == 'missing'
+    assert links[0].article_id == 2
+
+
+def test_broken_links_ignore_deleted_sources(client):
+    assert 'nowhere' not in {l.target for l in WikiLink.get_broken()}
+
+
+def test_orphaned_articles(client):
+    assert WikiArticle.get_orphans() == [
+        {'id': 2, 'title': 'Wiki2'},
+        {'id': 3, 'title': 'Wiki3'},
+    ]
+
+
+def test_new_article_links(client):
+    article = WikiArticle.new(
+        title='Missing', contents='links to [[Wiki 3]]', user_id=1
+    )
+    assert WikiLink.get_broken() == []
+    assert [a['id'] for a in WikiLink.backlinks(article.id)] == [2]
+    assert [a['id'] for a in WikiLink.backlinks(3)] == [article.id]
+
+
+def test_edit_article_replaces_links(client):
+    article = WikiArticle.from_pk(2)
+    article.edit(title='Wiki2', contents='no more links', editor_id=1)
+    assert WikiLink.backlinks(1) == []
+    assert WikiLink.get_broken() == []
+
+
+def test_translation_links(client):
+    translation = WikiTranslation.from_attrs(article_id=1, language_id=2)
+    translation.edit(title='WikiUno', contents='[[Wiki 3]]', editor_id=1)
+    assert [a['id'] for a in WikiLink.backlinks(3)] == [1]
@@ -0,0 +1,157 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine.url import make_url
+
+from core import cache, db
+from wiki.models import WikiArticle, WikiRevision
+from wiki.replica import (
+    REPLICA_BIND,
+    mark_recent_write,
+    read_replica,
+    reading_from_replica,
+)
+
+
+def _set_replica(app, monkeypatch, url):
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    binds[REPLICA_BIND] = str(url)
+    monkeypatch.setitem(app.config, 'SQLALCHEMY_BINDS', binds)
+
+
+@pytest.fixture
+def replica(app, client, monkeypatch):
+    """
+    Create a second local database standing in for a lagging read replica. It holds
+    a single article, whose title differs from the primary's, and its first two
+    revisions.
+    """
+    primary_url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    replica_url = make_url(str(primary_url))
+    replica_url.database = f'{primary_url.database}_replica'
+
+    admin = create_engine(str(primary_url), isolation_level='AUTOCOMMIT')
+    with admin.connect() as conn:
+        if not conn.execute(
+            text('SELECT 1 FROM pg_database WHERE datname = :name'),
+            name=replica_url.database,
+        ).scalar():
+            conn.execute(f'CREATE DATABASE "{replica_url.database}"')
+    admin.dispose()
+
+    _set_replica(app, monkeypatch, replica_url)
+    engine = db.get_engine(app, bind=REPLICA_BIND)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # Skip foreign key checks, so that users need not be copied over.
+        conn.execute('SET session_replication_role = replica')
+        conn.execute(
+            "INSERT INTO wiki_articles (id, title, contents, deleted) VALUES "
+            "(1, 'ReplicaWiki1', 'ReplicaContents1', 'f')"
+        )
+        conn.execute(
+            """
+            INSERT INTO wiki_revisions
+                (revision_id, article_id, language_id, title, editor_id, contents)
+            VALUES
+            (1, 1, 1, 'Wiki1', 2, 'OldContents1'),
+            (2, 1, 1, 'Wiki1', 1, 'Contents1')
+            """
+        )
+    yield engine
+    db.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def test_reading_from_replica(app, replica):
+    with reading_from_replica() as on_replica:
+        assert on_replica
+        articles = WikiArticle.get_all()
+    assert [a.title for a in articles] == ['ReplicaWiki1']
+
+
+def test_reading_without_replica_configured(app, client):
+    with reading_from_replica() as on_replica:
+        assert not on_replica
+        assert len(WikiArticle.get_all()) == 3
+
+
+def test_reading_from_replica_restores_primary(app, replica):
+    with reading_from_replica():
+        WikiArticle.query.all()
+    assert WikiArticle.query.count() == 4
+
+
+def test_read_your_writes(app, replica):
+    WikiRevision.new(
+        article_id=1, title='Wiki1', language_id=1, editor_id=2, contents='a'
+    )
+    with reading_from_replica(user_id=2) as on_replica:
+        assert not on_replica
+    with reading_from_replica(user_id=3) as on_replica:
+        assert on_replica
+
+
+def test_mark_recent_write_without_replica(app, client, monkeypatch):
+    mark_recent_write(2)
+    _set_replica(app, monkeypatch, 'postgresql:///unused')
+    with reading_from_replica(user_id=2) as on_replica:
+        assert on_replica
+
+
+def test_read_replica_falls_back_to_primary(app, client, monkeypatch):
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    url.database = f'{url.database}_nonexistent'
+    _set_replica(app, monkeypatch, url)
+
+    @read_replica
+    def count_articles():
+        return len(WikiArticle.query.all())
+
+    with app.test_request_context('/'):
+        assert count_articles() == 4
+
+
+def test_replica_reads_cached(app, replica):
+    with reading_from_replica():
+        WikiArticle.get_all()
+        WikiRevision.latest_revision(1)
+    assert cache.get(WikiArticle.__cache_key_all__)
+    assert (
+        cache.get(
+            WikiRevision.__cache_key_latest_id_of_article__.format(
+                article_id=1, language_id=1
+            )
+        )
+        is None
+    )
+
+
+def test_stale_replica_read_after_new_revision(app, replica):
+    revision = WikiRevision.new(
+        article_id=1, title='Wiki1', language_id=1, editor_id=2, contents='a'
+    )
+    assert revision.revision_id == 3
+    with reading_from_replica() as on_replica:
+        assert on_replica
+        assert WikiRevision.latest_revision(1).revision_id == 2
+    assert WikiRevision.latest_revision(1).revision_id == 3
+    revision = WikiRevision.new(
+        article_id=1, title='Wiki1', language_id=1, editor_id=2, contents='b'
+    )
+    assert revision.revision_id == 4
+
+
+def test_new_revision_ignores_stale_cached_latest(app, replica):
+    WikiRevision.new(
+        article_id=1, title='Wiki1', language_id=1, editor_id=2, contents='a'
+    )
+    cache.set(
+        WikiRevision.__cache_key_latest_id_of_article__.format(
+            article_id=1, language_id=1
+        ),
+        1,
+    )
+    revision = WikiRevision.new(
+        article_id=1, title='Wiki1', language_id=1, editor_id=2, contents='b'
+    )
+    assert revision.revision_id == 4
@@ -0,0 +1,171 @@
+import gzip
+import hashlib
+import json
+
+import pytest
+
+from core import cache
+from wiki.models import WikiArticle, WikiRevision
+from wiki.responses import encode_payload
+
+LARGE = 'wiki ' * 1000
+
+
+@pytest.fixture
+def large_article(client):
+    article = WikiArticle.new(title='Large', contents=LARGE, user_id=1)
+    return article.id
+
+
+def test_encode_payload_identity():
+    body = json.dumps({'contents': LARGE}).encode()
+    assert encode_payload(body, 'application/json', None) == (
+        body,
+        'application/json',
+        None,
+    )
+
+
+def test_encode_payload_gzip():
+    body = json.dumps({'contents': LARGE}).encode()
+    encoded, _, coding = encode_payload(body, 'application/json', 'gzip')
+    assert coding == 'gzip'
+    assert gzip.decompress(encoded) == body
+
+
+def test_encode_payload_small_uncompressed():
+    body = json.dumps({'contents': 'small'}).encode()
+    assert encode_payload(body, 'application/json', 'gzip')[2] is None
+
+
+def test_view_article_identity(authed_client, large_article):
+    response = authed_client.get(f'/wiki/articles/{large_article}')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json()['response']['contents'] == LARGE
+
+
+def test_view_article_gzip(authed_client, large_article):
+    response = authed_client.get(
+        f'/wiki/articles/{large_article}', headers={'Accept-Encoding': 'gzip'}
+    )
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert {'Accept', 'Accept-Encoding'} <= set(response.vary)
+    data = json.loads(gzip.decompress(response.get_data()))
+    assert data['response']['contents'] == LARGE
+
+
+def test_view_article_brotli(authed_client, large_article):
+    brotli = pytest.importorskip('brotli')
+    response = authed_client.get(
+        f'/wiki/articles/{large_article}',
+        headers={'Accept-Encoding': 'gzip;q=0.5, br'},
+    )
+    assert response.headers['Content-Encoding'] == 'br'
+    data = json.loads(brotli.decompress(response.get_data()))
+    assert data['response']['contents'] == LARGE
+
+
+def test_view_article_msgpack(authed_client, large_article):
+    msgpack = pytest.importorskip('msgpack')
+    response = authed_client.get(
+        f'/wiki/articles/{large_article}',
+        headers={'Accept': 'application/msgpack'},
+    )
+    assert response.status_code == 200
+    assert response.mimetype == 'application/msgpack'
+    data = msgpack.unpackb(response.get_data(), raw=False)
+    assert data['response']['contents'] == LARGE
+
+
+def test_view_article_error_not_encoded(authed_client):
+    response = authed_client.get(
+        '/wiki/articles/99', headers={'Accept-Encoding': 'gzip'}
+    )
+    assert response.status_code == 404
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json()
+
+
+def test_view_revision_gzip_cached(authed_client, large_article):
+    key = WikiRevision.__cache_key_payload__.format(
+        article_id=large_article, language_id=1, revision_id=1
+    )
+    responses = [
+        authed_client.get(
+            f'/wiki/articles/{large_article}/revisions/1',
+            headers={'Accept-Encoding': 'gzip'},
+        )
+        for _ in range(2)
+    ]
+    assert json.loads(cache.get(key))['contents'] == LARGE
+    # Encoded bodies are keyed by the body the other hooks produced.
+    digest = hashlib.sha1(gzip.decompress(responses[0].get_data())).hexdigest()
+    assert cache.get(f'{key}_application/json_gzip_{digest}')
+    for response in responses:
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        data = json.loads(gzip.decompress(response.get_data()))
+        assert data['response']['contents'] == LARGE
+    assert responses[0].get_data() == responses[1].get_data()
+
+
+def test_view_revision_msgpack(authed_client, large_article):
+    msgpack = pytest.importorskip('msgpack')
+    response = authed_client.get(
+        f'/wiki/articles/{large_article}/revisions/1',
+        headers={'Accept': 'application/msgpack'},
+    )
+    assert response.mimetype == 'application/msgpack'
+    data = msgpack.unpackb(response.get_data(), raw=False)
+    assert data['response']['revision_id'] == 1
+
+
+def test_view_revision_language(authed_client):
+    response = authed_client.get(
+        '/wiki/articles/1/revisions/1', query_string={'language': 'es'}
+    )
+    assert response.status_code == 200
+    assert response.get_json()['response']['title'] == 'WikiUno'
+    response = authed_client.get('/wiki/articles/1/revisions/1')
+    assert response.get_json()['response']['title'] == 'Wiki1'
+
+
+def test_view_revision_nonexistent(authed_client):
+    response = authed_client.get('/wiki/articles/1/revisions/9')
+    assert response.status_code == 404
+
+
+def test_view_revisions(authed_client):
+    response = authed_client.get(
+        '/wiki/articles/1/revisions', query_string={'limit': '1'}
+    )
+    assert response.status_code == 200
+    data = response.get_json()['response']
+    assert [r['revision_id'] for r in data] == [2]
+
+
+def test_view_revisions_invalid_limit(authed_client):
+    response = authed_client.get(
+        '/wiki/articles/1/revisions', query_string={'limit': '0'}
+    )
+    assert response.status_code == 400
+
+
+def test_view_revision_deleted_article(authed_client):
+    for url in ('/wiki/articles/4/revisions/1', '/wiki/articles/4/revisions'):
+        response = authed_client.get(url)
+        assert response.status_code == 404
+
+
+def test_view_revision_deleted_translation(authed_client):
+    response = authed_client.get(
+        '/wiki/articles/2/revisions/1', query_string={'language': 'fr'}
+    )
+    assert response.status_code == 404
+    response = authed_client.get(
+        '/wiki/articles/2/revisions/1', query_string={'language': 'es'}
+    )
+    assert response.status_code == 200
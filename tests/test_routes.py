@@ -0,0 +1,125 @@
+def test_view_alias(authed_client):
+    response = authed_client.get('/wiki/aliases/Wiki Uno')
+    assert response.status_code == 200
+    data = response.get_json()['response']
+    assert data['id'] == 1
+    assert data['title'] == 'Wiki1'
+
+
+def test_view_alias_nonexistent(authed_client):
+    response = authed_client.get('/wiki/aliases/nonexistent')
+    assert response.status_code == 404
+
+
+def test_autocomplete(authed_client):
+    response = authed_client.get(
+        '/wiki/autocomplete', query_string={'prefix': 'Wiki', 'limit': '2'}
+    )
+    assert response.status_code == 200
+    assert response.get_json()['response'] == [
+        {'alias': 'wiki1', 'article_id': 1},
+        {'alias': 'wiki2', 'article_id': 2},
+    ]
+
+
+def test_autocomplete_invalid_limit(authed_client):
+    for limit in ('0', 'abc', '51'):
+        response = authed_client.get(
+            '/wiki/autocomplete', query_string={'prefix': 'w', 'limit': limit}
+        )
+        assert response.status_code == 400
+
+
+def test_autocomplete_missing_prefix(authed_client):
+    response = authed_client.get('/wiki/autocomplete')
+    assert response.status_code == 400
+
+
+def test_view_backlinks(authed_client):
+    response = authed_client.get('/wiki/articles/1/backlinks')
+    assert response.status_code == 200
+    assert response.get_json()['response'] == [{'id': 2, 'title': 'Wiki2'}]
+
+
+def test_view_backlinks_paginated(authed_client):
+    response = authed_client.get(
+        '/wiki/articles/1/backlinks', query_string={'page': '2'}
+    )
+    assert response.status_code == 200
+    assert response.get_json()['response'] == []
+
+
+def test_view_backlinks_nonexistent(authed_client):
+    response = authed_client.get('/wiki/articles/99/backlinks')
+    assert response.status_code == 404
+
+
+def test_view_broken_links(authed_client):
+    response = authed_client.get(
+        '/wiki/links/broken', query_string={'limit': '10'}
+    )
+    assert response.status_code == 200
+    assert response.get_json()['response'] == [
+        {'article_id': 2, 'language_id': 1, 'target': 'missing'}
+    ]
+
+
+def test_view_orphans(authed_client):
+    response = authed_client.get(
+        '/wiki/articles/orphans', query_string={'page': '1', 'limit': '1'}
+    )
+    assert response.status_code == 200
+    assert response.get_json()['response'] == [{'id': 2, 'title': 'Wiki2'}]
+
+
+def test_link_routes_invalid_pagination(authed_client):
+    for query_string in ({'page': '0'}, {'limit': '101'}, {'page': 'x'}):
+        response = authed_client.get(
+            '/wiki/links/broken', query_string=query_string
+        )
+        assert response.status_code == 400
+
+
+def test_create_article(authed_client):
+    response = authed_client.post(
+        '/wiki/create', json={'title': 'New Article', 'contents': 'new'}
+    )
+    assert response.status_code == 200
+    assert response.get_json()['response']['title'] == 'New Article'
+
+
+def test_create_article_taken_alias(authed_client):
+    response = authed_client.post(
+        '/wiki/create', json={'title': 'Wiki 1', 'contents': 'new'}
+    )
+    assert response.status_code == 400
+
+
+def test_edit_article(authed_client):
+    response = authed_client.put(
+        '/wiki/modify/1',
+        json={'title': 'Wiki1', 'language': 'en', 'contents': 'edited'},
+    )
+    assert response.status_code == 200
+    data = response.get_json()['response']
+    assert data['contents'] == 'edited'
+    assert data['latest_revision']['revision_id'] == 3
+
+
+def test_edit_translation(authed_client):
+    response = authed_client.put(
+        '/wiki/modify/1',
+        json={'title': 'WikiUno', 'language': 'es', 'contents': 'editado'},
+    )
+    assert response.status_code == 200
+    data = response.get_json()['response']
+    assert data['contents'] == 'editado'
+    assert data['latest_revision']['revision_id'] == 2
+
+
+def test_edit_missing_translation(authed_client):
+    response = authed_client.put(
+        '/wiki/modify/3',
+        json={'title': 'Wiki3', 'language': 'fr', 'contents': 'edite'},
+    )
+    assert response.status_code == 404
@@ -0,0 +1,81 @@
+"""wiki links
+
+Revision ID: 3d7a5b0e19c6
+Revises: 8c1f3e92a7d4
+Create Date: 2026-10-19 11:04:27.590114
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d7a5b0e19c6'
+down_revision = '8c1f3e92a7d4'
+branch_labels = None
+depends_on = None
+
+# Frozen copies of ``wiki.models.LINK_REGEX`` and ``WikiAlias.str_to_alias``, so that
+# this migration keeps extracting links the same way if the models change.
+LINK_REGEX = re.compile(r'\[\[([^\[\]|]+)(?:\|[^\[\]]*)?\]\]')
+BATCH_SIZE = 1000
+
+
+def extract_targets(contents):
+    targets = []
+    for match in LINK_REGEX.finditer(contents):
+        target = re.sub(r'\s', '', match.group(1).lower())[:128]
+        if target and target not in targets:
+            targets.append(target)
+    return targets
+
+
+def upgrade():
+    op.create_table(
+        'wiki_links',
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('language_id', sa.Integer(), nullable=False),
+        sa.Column('target', sa.String(length=128), nullable=False),
+        sa.ForeignKeyConstraint(['article_id'], ['wiki_articles.id']),
+        sa.ForeignKeyConstraint(['language_id'], ['wiki_languages.id']),
+        sa.PrimaryKeyConstraint('article_id', 'language_id', 'target'),
+    )
+    op.create_index(
+        op.f('ix_wiki_links_target'), 'wiki_links', ['target'], unique=False
+    )
+    backfill_links()
+
+
+def backfill_links():
+    """Extract the links of every existing article and translation."""
+    wiki_links = sa.table(
+        'wiki_links',
+        sa.column('article_id', sa.Integer),
+        sa.column('language_id', sa.Integer),
+        sa.column('target', sa.String),
+    )
+    sources = sa.text(
+        """
+        SELECT id, 1, contents FROM wiki_articles
+        UNION ALL
+        SELECT article_id, language_id, contents FROM wiki_translations
+        """
+    )
+    batch = []
+    for article_id, language_id, contents in op.get_bind().execute(sources):
+        batch.extend(
+            {'article_id': article_id, 'language_id': language_id, 'target': t}
+            for t in extract_targets(contents)
+        )
+        if len(batch) >= BATCH_SIZE:
+            op.bulk_insert(wiki_links, batch)
+            batch = []
+    if batch:
+        op.bulk_insert(wiki_links, batch)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_wiki_links_target'), table_name='wiki_links')
+    op.drop_table('wiki_links')
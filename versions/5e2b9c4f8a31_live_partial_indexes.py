@@ -0,0 +1,44 @@
+"""live partial indexes
+
+Revision ID: 5e2b9c4f8a31
+Revises: 3d7a5b0e19c6
+Create Date: 2026-10-19 13:36:52.841950
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b9c4f8a31'
+down_revision = '3d7a5b0e19c6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_wiki_articles_deleted', table_name='wiki_articles')
+    op.drop_index(
+        'ix_wiki_translations_deleted', table_name='wiki_translations'
+    )
+    op.create_index(
+        'ix_wiki_articles_live',
+        'wiki_articles',
+        ['id'],
+        postgresql_where=sa.text('NOT deleted'),
+    )
+    op.create_index(
+        'ix_wiki_translations_live',
+        'wiki_translations',
+        ['article_id', 'language_id'],
+        postgresql_where=sa.text('NOT deleted'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_wiki_translations_live', table_name='wiki_translations')
+    op.drop_index('ix_wiki_articles_live', table_name='wiki_articles')
+    op.create_index(
+        'ix_wiki_translations_deleted', 'wiki_translations', ['deleted']
+    )
+    op.create_index('ix_wiki_articles_deleted', 'wiki_articles', ['deleted'])
@@ -0,0 +1,32 @@
+"""alias prefix index
+
+Revision ID: 8c1f3e92a7d4
+Revises: 24b89ffe76a4
+Create Date: 2026-10-19 10:12:41.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1f3e92a7d4'
+down_revision = '24b89ffe76a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_wiki_aliases_alias_prefix',
+        'wiki_aliases',
+        [sa.text('alias COLLATE "C"')],
+    )
+    op.create_index(
+        op.f('ix_wiki_aliases_article_id'), 'wiki_aliases', ['article_id']
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_wiki_aliases_article_id'), table_name='wiki_aliases')
+    op.drop_index('ix_wiki_aliases_alias_prefix', table_name='wiki_aliases')
@@ -1,4 +1,5 @@
-from werkzeug import find_modules, import_string
+import time
+from importlib import import_module
 
 from wiki import routes
 
@@ -6,9 +7,35 @@ from wiki import routes
 
 PERMISSIONS = ['wiki_view']  # View the wiki
 
+# Modules imported when the plugin is initialized. Route modules attach their views
+# to the blueprint on import, so they must be listed here to be served.
+MODULES = (
+    'wiki.models',
+    'wiki.routes.aliases',
+    'wiki.routes.articles',
+    'wiki.routes.links',
+    'wiki.routes.revisions',
+)
+
 
 def init_app(app):
+    start = time.perf_counter()
+    timings = {}
     with app.app_context():
-        for name in find_modules('wiki', recursive=True):
-            import_string(name)
+        for name in MODULES:
+            module_start = time.perf_counter()
+            import_module(name)
+            timings[name] = time.perf_counter() - module_start
         app.register_blueprint(routes.bp)
+        # After-request hooks run in reverse order of registration, so inserting
+        # this first makes it run last, once others have seen the plain JSON body.
+        app.after_request_funcs.setdefault(None, []).insert(
+            0, import_module('wiki.responses').encode_response
+        )
+    timings['total'] = time.perf_counter() - start
+    app.extensions.setdefault('plugin_startup', {})['wiki'] = timings
+    app.logger.info(
+        'Initialized plugin wiki in %.1fms (%s).',
+        timings['total'] * 1000,
+        ', '.join(f'{n}: {timings[n] * 1000:.1f}ms' for n in MODULES),
+    )
@@ -2,49 +2,65 @@ import re
 from datetime import datetime
 from typing import List, Optional
 
-import flask
-from sqlalchemy import and_, func
+from sqlalchemy import and_, exists, func, or_
+from sqlalchemy.orm import aliased
 
 from core import APIException, cache, db
 from core.mixins import MultiPKMixin, SinglePKMixin
 from core.users.models import User
 from core.utils import cached_property
 from wiki.exceptions import WikiNoRevisions
+from wiki.replica import mark_recent_write, on_replica
 from wiki.serializers import (
+    WikiAliasSerializer,
     WikiArticleSerializer,
     WikiLanguageSerializer,
+    WikiLinkSerializer,
     WikiRevisionSerializer,
     WikiTranslationSerializer,
 )
 
-app = flask.current_app
+LINK_REGEX = re.compile(r'\[\[([^\[\]|]+)(?:\|[^\[\]]*)?\]\]')
 
 
 class WikiArticle(db.Model, SinglePKMixin):
     __tablename__ = 'wiki_articles'
     __cache_key__ = 'wiki_articles_{id}'
     __cache_key_all__ = 'wiki_articles_all'
+    __cache_key_all_with_dead__ = 'wiki_articles_all_with_dead'
     __serializer__ = WikiArticleSerializer
     __deletion_attr__ = 'deleted'
+    __table_args__ = (
+        db.Index(
+            'ix_wiki_articles_live',
+            'id',
+            postgresql_where=db.text('NOT deleted'),
+        ),
+    )
 
     id: int = db.Column(db.Integer, primary_key=True)
     title: str = db.Column(db.String(128), nullable=False)
     contents: str = db.Column(db.Text, nullable=False)
-    deleted: bool = db.Column(
-        db.Boolean, nullable=False, server_default='f', index=True
-    )
+    deleted: bool = db.Column(db.Boolean, nullable=False, server_default='f')
 
     @classmethod
     def get_all(cls, include_dead: bool = False) -> List['WikiArticle']:
         return cls.get_many(
-            key=cls.__cache_key_all__, include_dead=include_dead
+            key=(
+                cls.__cache_key_all_with_dead__
+                if include_dead
+                else cls.__cache_key_all__
+            ),
+            include_dead=include_dead,
         )
 
     @classmethod
     def new(cls, title: str, contents: str, user_id: int) -> 'WikiArticle':
         User.is_valid(user_id, error=True)
         WikiAlias.is_valid(title, error=True)
-        cache.delete(cls.__cache_key_all__)
+        cache.delete_many(
+            cls.__cache_key_all__, cls.__cache_key_all_with_dead__
+        )
         article = super()._new(title=title, contents=contents)
         WikiAlias.new(alias=title, article_id=article.id)
         WikiRevision.new(
@@ -54,6 +70,9 @@ class WikiArticle(db.Model, SinglePKMixin):
             editor_id=user_id,
             contents=contents,
         )
+        WikiLink.update_from_contents(
+            article_id=article.id, language_id=1, contents=contents
+        )
         return article
 
     def edit(self, title: str, contents: str, editor_id: int) -> None:
@@ -68,6 +87,9 @@ class WikiArticle(db.Model, SinglePKMixin):
             WikiAlias.new(alias=title, article_id=self.id)
         self.title = title
         self.contents = contents
+        WikiLink.update_from_contents(
+            article_id=self.id, language_id=1, contents=contents
+        )
         self.del_property_cache('latest_revision')
         self.del_property_cache('aliases')
 
@@ -83,12 +105,45 @@ class WikiArticle(db.Model, SinglePKMixin):
     def languages(self):
         return WikiTranslation.languages_from_article(self.id)
 
+    @classmethod
+    def get_orphans(cls, page: int = 1, limit: int = 50) -> List[dict]:
+        """
+        Get the ids and titles of the live articles which no other live article or
+        translation links to.
+        """
+        source = aliased(cls)
+        linked = exists().where(
+            and_(
+                WikiAlias.article_id == cls.id,
+                WikiLink.target == WikiAlias.alias,
+                WikiLink.article_id != cls.id,
+                source.id == WikiLink.article_id,
+                WikiLink.source_is_live(source),
+            )
+        )
+        query = (
+            db.session.query(cls.id, cls.title)
+            .filter(and_(cls.deleted == 'f', ~linked))
+            .order_by(cls.id.asc())  # type: ignore
+            .offset((page - 1) * limit)
+            .limit(limit)
+        )
+        return [{'id': id, 'title': title} for id, title in query]
+
 
 class WikiTranslation(db.Model, MultiPKMixin):
     __tablename__ = 'wiki_translations'
     __cache_key__ = 'wiki_translations_article_{article_id}_{language_id}'
     __cache_key_from_article__ = 'wiki_translations_of_article_{article_id}'
     __serializer__ = WikiTranslationSerializer
+    __table_args__ = (
+        db.Index(
+            'ix_wiki_translations_live',
+            'article_id',
+            'language_id',
+            postgresql_where=db.text('NOT deleted'),
+        ),
+    )
 
     article_id: int = db.Column(
         db.Integer, db.ForeignKey('wiki_articles.id'), primary_key=True
@@ -98,9 +153,7 @@ class WikiTranslation(db.Model, MultiPKMixin):
     )
     title: str = db.Column(db.String(128), nullable=False)
     contents: str = db.Column(db.Text, nullable=False)
-    deleted: bool = db.Column(
-        db.Boolean, nullable=False, server_default='f', index=True
-    )
+    deleted: bool = db.Column(db.Boolean, nullable=False, server_default='f')
 
     @classmethod
     def languages_from_article(cls, article_id: int) -> List['WikiLanguage']:
@@ -144,6 +197,9 @@ class WikiTranslation(db.Model, MultiPKMixin):
             editor_id=user_id,
             contents=contents,
         )
+        WikiLink.update_from_contents(
+            article_id=article_id, language_id=language_id, contents=contents
+        )
         return translation
 
     def edit(self, title: str, contents: str, editor_id: int) -> None:
@@ -158,6 +214,11 @@ class WikiTranslation(db.Model, MultiPKMixin):
             WikiAlias.new(alias=title, article_id=self.article_id)
         self.title = title
         self.contents = contents
+        WikiLink.update_from_contents(
+            article_id=self.article_id,
+            language_id=self.language_id,
+            contents=contents,
+        )
         self.del_property_cache('latest_revision')
         self.parent_article.del_property_cache('aliases')
 
@@ -176,9 +237,18 @@ class WikiTranslation(db.Model, MultiPKMixin):
 
 class WikiRevision(db.Model, MultiPKMixin):
     __tablename__ = 'wiki_revisions'
-    __cache_key__ = 'wiki_revisions_articles_{article_id}_{revision_id}'
-    __cache_key_of_article__ = 'wiki_revisions_of_article_{article_id}'
-    __cache_key_latest_id_of_article__ = 'wiki_revisions_latest_{article_id}'
+    __cache_key__ = (
+        'wiki_revisions_articles_{article_id}_{language_id}_{revision_id}'
+    )
+    __cache_key_of_article__ = (
+        'wiki_revisions_of_article_{article_id}_{language_id}'
+    )
+    __cache_key_latest_id_of_article__ = (
+        'wiki_revisions_latest_{article_id}_{language_id}'
+    )
+    __cache_key_payload__ = (
+        'wiki_revisions_payload_{article_id}_{language_id}_{revision_id}'
+    )
     __serializer__ = WikiRevisionSerializer
 
     revision_id: int = db.Column(db.Integer, primary_key=True)
@@ -206,7 +276,9 @@ class WikiRevision(db.Model, MultiPKMixin):
         limit: int = 50,
     ) -> List['WikiRevision']:
         return cls.get_many(
-            key=cls.__cache_key_of_article__.format(article_id=article_id),
+            key=cls.__cache_key_of_article__.format(
+                article_id=article_id, language_id=language_id
+            ),
             filter=and_(
                 cls.article_id == article_id, cls.language_id == language_id
             ),
@@ -226,18 +298,28 @@ class WikiRevision(db.Model, MultiPKMixin):
     ) -> Optional['WikiRevision']:
         WikiArticle.is_valid(article_id, error=True)
         WikiLanguage.is_valid(language_id, error=True)
-        try:
-            old_latest_id = (
-                cls.latest_revision(article_id).revision_id + 1
-            )  # type: ignore
-        except WikiNoRevisions:
-            old_latest_id = 1
+        # Read from the primary rather than the cache, which may have been filled
+        # from a lagging replica.
+        old_latest_id = (
+            db.session.query(func.max(cls.revision_id))
+            .filter(
+                and_(
+                    cls.article_id == article_id,
+                    cls.language_id == language_id,
+                )
+            )
+            .scalar()
+            or 0
+        ) + 1
         cache.delete_many(
-            cls.__cache_key_of_article__.format(article_id=article_id),
+            cls.__cache_key_of_article__.format(
+                article_id=article_id, language_id=language_id
+            ),
             cls.__cache_key_latest_id_of_article__.format(
-                article_id=article_id
+                article_id=article_id, language_id=language_id
             ),
         )
+        mark_recent_write(editor_id)
         return super()._new(
             revision_id=old_latest_id,
             article_id=article_id,
@@ -273,7 +355,10 @@ class WikiRevision(db.Model, MultiPKMixin):
             )
             if not latest_revision:
                 raise WikiNoRevisions
-            cache.set(cache_key, latest_revision.revision_id)
+            # A lagging replica would keep serving the previous revision as the
+            # latest until the key expires.
+            if not on_replica():
+                cache.set(cache_key, latest_revision.revision_id)
         return latest_revision
 
     @property
@@ -294,9 +379,12 @@ class WikiAlias(db.Model, SinglePKMixin):
     __cache_key__ = 'wiki_aliases_alias_{alias}'
     __cache_key_of_article__ = 'wiki_aliases_articles_{article_id}'
     # IF YOU ADD ANOTHER CACHE KEY MAKE SURE IT CANNOT COLLIDE WITH `__cache_key__`.
+    __serializer__ = WikiAliasSerializer
 
     alias: str = db.Column(db.String(128), primary_key=True)
-    article_id: int = db.Column(db.Integer, db.ForeignKey('wiki_articles.id'))
+    article_id: int = db.Column(
+        db.Integer, db.ForeignKey('wiki_articles.id'), index=True
+    )
 
     @classmethod
     def from_article(cls, article_id: int) -> List[str]:
@@ -315,6 +403,29 @@ class WikiAlias(db.Model, SinglePKMixin):
         )
         return cls._new(article_id=article_id, alias=cls.str_to_alias(alias))
 
+    @classmethod
+    def from_prefix(cls, prefix: str, limit: int = 10) -> List['WikiAlias']:
+        """
+        Get the aliases of live articles starting with the alias form of ``prefix``,
+        in byte order. Both the match and the order are served by the ``C`` collated
+        index on ``alias``, so this is not cached.
+        """
+        alias = cls.alias.collate('C')
+        return (
+            cls.query.join(WikiArticle, WikiArticle.id == cls.article_id)
+            .filter(
+                and_(
+                    alias.startswith(
+                        cls.str_to_alias(prefix), autoescape=True
+                    ),
+                    WikiArticle.deleted == 'f',
+                )
+            )
+            .order_by(alias.asc())
+            .limit(limit)
+            .all()
+        )
+
     @classmethod
     def is_valid(cls, pk: str, error: bool = False) -> bool:
         """
@@ -335,6 +446,124 @@ class WikiAlias(db.Model, SinglePKMixin):
         return re.sub(r'\s', '', stri.lower())
 
 
+# The primary key index uses the database collation, which can neither serve
+# ``LIKE 'prefix%'`` queries nor return their matches in a usable order. This one
+# can do both.
+db.Index('ix_wiki_aliases_alias_prefix', WikiAlias.alias.collate('C'))
+
+
+class WikiLink(db.Model, MultiPKMixin):
+    __tablename__ = 'wiki_links'
+    __cache_key__ = 'wiki_links_{article_id}_{language_id}_{target}'
+    __serializer__ = WikiLinkSerializer
+
+    article_id: int = db.Column(
+        db.Integer, db.ForeignKey('wiki_articles.id'), primary_key=True
+    )
+    language_id: int = db.Column(
+        db.Integer, db.ForeignKey('wiki_languages.id'), primary_key=True
+    )
+    target: str = db.Column(db.String(128), primary_key=True, index=True)
+
+    @classmethod
+    def update_from_contents(
+        cls, article_id: int, language_id: int, contents: str
+    ) -> None:
+        """
+        Replace the stored outgoing links of an article's translation with the
+        ones present in its new contents.
+        """
+        cls.query.filter(
+            and_(cls.article_id == article_id, cls.language_id == language_id)
+        ).delete()
+        db.session.add_all(
+            cls(article_id=article_id, language_id=language_id, target=target)
+            for target in cls.extract_targets(contents)
+        )
+        db.session.commit()
+
+    @classmethod
+    def backlinks(
+        cls, article_id: int, page: int = 1, limit: int = 50
+    ) -> List[dict]:
+        """
+        Get the ids and titles of the live articles which link to any alias of the
+        given article from a live article or translation.
+        """
+        query = (
+            db.session.query(WikiArticle.id, WikiArticle.title)
+            .select_from(cls)
+            .join(WikiAlias, WikiAlias.alias == cls.target)
+            .join(WikiArticle, WikiArticle.id == cls.article_id)
+            .filter(
+                and_(
+                    WikiAlias.article_id == article_id,
+                    cls.article_id != article_id,
+                    cls.source_is_live(WikiArticle),
+                )
+            )
+            .distinct()
+            .order_by(WikiArticle.id.asc())  # type: ignore
+            .offset((page - 1) * limit)
+            .limit(limit)
+        )
+        return [{'id': id, 'title': title} for id, title in query]
+
+    @classmethod
+    def get_broken(cls, page: int = 1, limit: int = 50) -> List['WikiLink']:
+        """
+        Get the links from live articles and translations whose target does not
+        resolve to any alias.
+        """
+        return (
+            cls.query.join(WikiArticle, WikiArticle.id == cls.article_id)
+            .outerjoin(WikiAlias, WikiAlias.alias == cls.target)
+            .filter(
+                and_(
+                    WikiAlias.alias.is_(None),  # type: ignore
+                    cls.source_is_live(WikiArticle),
+                )
+            )
+            .order_by(cls.target.asc(), cls.article_id.asc())  # type: ignore
+            .offset((page - 1) * limit)
+            .limit(limit)
+            .all()
+        )
+
+    @classmethod
+    def source_is_live(cls, source):
+        """
+        Build the condition that a link's source, ``source`` being the article it is
+        joined to, is live. Links from translations also need the translation live.
+        """
+        return and_(
+            source.deleted == 'f',
+            or_(
+                cls.language_id == 1,
+                exists().where(
+                    and_(
+                        WikiTranslation.article_id == cls.article_id,
+                        WikiTranslation.language_id == cls.language_id,
+                        WikiTranslation.deleted == 'f',
+                    )
+                ),
+            ),
+        )
+
+    @staticmethod
+    def extract_targets(contents: str) -> List[str]:
+        """
+        Get the alias forms of the ``[[Title]]`` and ``[[Title|text]]`` links in a
+        body of contents, without duplicates.
+        """
+        targets = []
+        for match in LINK_REGEX.finditer(contents):
+            target = WikiAlias.str_to_alias(match.group(1))[:128]
+            if target and target not in targets:
+                targets.append(target)
+        return targets
+
+
 class WikiLanguage(db.Model, SinglePKMixin):
     __tablename__ = 'wiki_languages'
     __cache_key__ = 'wiki_language_{id}'
@@ -0,0 +1,93 @@
+import functools
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+import flask
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from core import cache, db
+
+# Name of the ``SQLALCHEMY_BINDS`` entry pointing at the read replica. Reads always
+# go to the primary when it is not configured.
+REPLICA_BIND = 'wiki_replica'
+STICKY_CACHE_KEY = 'wiki_replica_sticky_{user_id}'
+# Seconds after a write during which its author reads from the primary. Should
+# comfortably exceed the replication lag.
+DEFAULT_STICKY_SECONDS = 10
+
+
+def replica_configured() -> bool:
+    binds = flask.current_app.config.get('SQLALCHEMY_BINDS') or {}
+    return REPLICA_BIND in binds
+
+
+def on_replica() -> bool:
+    """Whether queries are currently sent to the read replica."""
+    return flask.has_app_context() and bool(flask.g.get('wiki_on_replica'))
+
+
+def mark_recent_write(user_id: int) -> None:
+    """Send the user's reads to the primary until the replica catches up."""
+    if replica_configured():
+        cache.set(
+            STICKY_CACHE_KEY.format(user_id=user_id),
+            1,
+            timeout=flask.current_app.config.get(
+                'WIKI_REPLICA_STICKY_SECONDS', DEFAULT_STICKY_SECONDS
+            ),
+        )
+
+
+@contextmanager
+def reading_from_replica(user_id: int = None) -> Iterator[bool]:
+    """
+    Point ``db.session`` at the read replica for the duration of the block, so that
+    every query made in it, including those of the cached model helpers, is sent to
+    the replica. The block must not write to the database, and values a write is
+    expected to update at once, such as the latest revision id, must not be cached
+    from it; check ``on_replica`` for those. Yields whether the replica is in use,
+    which it is not when unconfigured or when ``user_id`` has written recently.
+    """
+    if not replica_configured() or (
+        user_id is not None
+        and cache.get(STICKY_CACHE_KEY.format(user_id=user_id))
+    ):
+        yield False
+        return
+
+    primary = db.session.registry()
+    replica = Session(
+        bind=db.get_engine(flask.current_app, bind=REPLICA_BIND)
+    )
+    db.session.registry.set(replica)
+    flask.g.wiki_on_replica = True
+    try:
+        yield True
+    finally:
+        flask.g.wiki_on_replica = False
+        db.session.registry.set(primary)
+        replica.close()
+
+
+def read_replica(func: Callable) -> Callable:
+    """
+    Decorate a read-only view to run it against the read replica, falling back to
+    the primary when the replica cannot be reached.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        user = flask.g.get('user')
+        with reading_from_replica(user.id if user else None) as on_replica:
+            if on_replica:
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError:
+                    flask.current_app.logger.warning(
+                        'Wiki read replica unavailable, reading from primary.',
+                        exc_info=True,
+                    )
+        return func(*args, **kwargs)
+
+    return wrapper
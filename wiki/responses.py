@@ -0,0 +1,117 @@
+import gzip
+import hashlib
+import json
+from typing import Any, Optional, Tuple
+
+import flask
+
+from core import cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+# Bodies smaller than this are sent uncompressed, as the savings are negligible.
+MIN_COMPRESS_SIZE = 1024
+# Cached payloads embed mutable data from other models, such as editor usernames,
+# so they are only kept for a short while.
+PAYLOAD_CACHE_TIMEOUT = 60 * 10
+
+
+def negotiated_response(obj: Any, cache_key: str = None) -> flask.Response:
+    """
+    Return a JSON response containing ``obj``, to be re-encoded by ``encode_response``
+    into the format and content coding the client prefers. The response goes through
+    the application's other after-request hooks as plain JSON first.
+
+    When a ``cache_key`` is passed, the JSON serialization of ``obj`` is cached under
+    it, and the re-encoded bodies built from it are cached too. Only pass one for
+    objects which never change.
+    """
+    flask.g.wiki_negotiate = True
+    if not cache_key:
+        return flask.jsonify(obj)
+    flask.g.wiki_payload_cache_key = cache_key
+    body = cache.get(cache_key)
+    if body is None:
+        body = flask.json.dumps(obj)
+        cache.set(cache_key, body, timeout=PAYLOAD_CACHE_TIMEOUT)
+    return flask.current_app.response_class(body, mimetype=JSON_MIMETYPE)
+
+
+def encode_response(response: flask.Response) -> flask.Response:
+    """
+    After-request hook re-encoding the bodies of successful ``negotiated_response``
+    responses. It must run after every other hook, which ``init_app`` ensures.
+
+    Encoded bodies of cached objects are cached by format, coding and a digest of the
+    body the other hooks produced, so per-request changes those hooks make are never
+    replayed to other requests.
+    """
+    if not flask.g.get('wiki_negotiate') or response.status_code != 200:
+        return response
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    mimetype, coding = _negotiate_mimetype(), _negotiate_coding()
+    if mimetype == JSON_MIMETYPE and not coding:
+        return response
+
+    body = response.get_data()
+    cache_key = flask.g.get('wiki_payload_cache_key')
+    payload = None
+    if cache_key:
+        digest = hashlib.sha1(body).hexdigest()
+        cache_key = f'{cache_key}_{mimetype}_{coding}_{digest}'
+        payload = cache.get(cache_key)
+    if payload is None:
+        payload = encode_payload(body, mimetype, coding)
+        if cache_key:
+            cache.set(cache_key, payload, timeout=PAYLOAD_CACHE_TIMEOUT)
+
+    body, mimetype, coding = payload
+    response.set_data(body)
+    response.mimetype = mimetype
+    if coding:
+        response.headers['Content-Encoding'] = coding
+    return response
+
+
+def encode_payload(
+    body: bytes, mimetype: str, coding: Optional[str]
+) -> Tuple[bytes, str, Optional[str]]:
+    """
+    Convert a JSON body to ``mimetype`` and compress it with ``coding``. Returns the
+    body, its mimetype and the content coding actually applied, which is ``None`` for
+    bodies too small to be worth compressing.
+
+    MessagePack bodies are converted from the final JSON, so that the application's
+    hooks can keep working on JSON. They save bandwidth, not serialization time.
+    """
+    if mimetype == MSGPACK_MIMETYPE:
+        body = msgpack.packb(json.loads(body), use_bin_type=True)
+    if not coding or len(body) < MIN_COMPRESS_SIZE:
+        return body, mimetype, None
+    if coding == 'br':
+        return brotli.compress(body), mimetype, coding
+    return gzip.compress(body, compresslevel=6), mimetype, coding
+
+
+def _negotiate_mimetype() -> str:
+    offers = [JSON_MIMETYPE]
+    if msgpack:
+        offers.append(MSGPACK_MIMETYPE)
+    mimetype = flask.request.accept_mimetypes.best_match(offers)
+    return mimetype or JSON_MIMETYPE
+
+
+def _negotiate_coding() -> Optional[str]:
+    offers = ['br', 'gzip'] if brotli else ['gzip']
+    return flask.request.accept_encodings.best_match(offers)
@@ -0,0 +1,44 @@
+import flask
+from voluptuous import All, Coerce, Length, Range, Required, Schema
+
+from core import APIException
+from core.utils import require_permission, validate_data
+from wiki.models import WikiAlias, WikiArticle
+from wiki.permissions import WikiPermissions
+from wiki.replica import read_replica
+
+from . import bp
+
+
+@bp.route('/wiki/aliases/<alias>', methods=['GET'])
+@require_permission(WikiPermissions.VIEW)
+@read_replica
+def view_wiki_alias(alias: str):
+    wiki_alias = WikiAlias.from_pk(WikiAlias.str_to_alias(alias))
+    if not wiki_alias:
+        raise APIException(f'WikiAlias {alias} does not exist.', 404)
+    return flask.jsonify(
+        WikiArticle.from_pk(
+            pk=wiki_alias.article_id,
+            _404=True,
+            include_dead=flask.g.user.has_permission(
+                WikiPermissions.VIEW_DELETED
+            ),
+        )
+    )
+
+
+AUTOCOMPLETE_SCHEMA = Schema(
+    {
+        Required('prefix'): All(str, Length(min=1, max=128)),
+        'limit': All(Coerce(int), Range(min=1, max=50)),
+    }
+)
+
+
+@bp.route('/wiki/autocomplete', methods=['GET'])
+@require_permission(WikiPermissions.VIEW)
+@validate_data(AUTOCOMPLETE_SCHEMA)
+@read_replica
+def autocomplete_wiki_alias(prefix: str, limit: int = 10):
+    return flask.jsonify(WikiAlias.from_prefix(prefix, limit=limit))
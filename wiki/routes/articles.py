@@ -1,35 +1,35 @@
 import flask
-from voluptuous import All, Any, Length, Range, Schema
+from voluptuous import All, Any, Length, Schema
 
 from core import APIException
 from core.utils import require_permission, validate_data
 from wiki.models import (
     WikiArticle,
     WikiLanguage,
-    WikiRevision,
     WikiTranslation,
 )
 from wiki.permissions import WikiPermissions
+from wiki.replica import read_replica
+from wiki.responses import negotiated_response
 
 from . import bp
 
-app = flask.current_app
-
 VIEW_ARTICLE_SCHEMA = Schema({'language': All(str, Length(max=128))})
 
 
 @bp.route('/wiki/articles/<int:id>', methods=['GET'])
 @require_permission(WikiPermissions.VIEW)
 @validate_data(VIEW_ARTICLE_SCHEMA)
+@read_replica
 def view_wiki_article(id: int, language: str):
     if language:
-        return flask.jsonify(
+        return negotiated_response(
             WikiTranslation.from_attrs(
                 article_id=id,
                 language_id=WikiLanguage.from_language(language).id,
             )
         )
-    return flask.jsonify(
+    return negotiated_response(
         WikiArticle.from_pk(
             pk=id,
             _404=True,
@@ -44,7 +44,7 @@ CREATE_ARTICLE_SCHEMA = Schema(
     {
         'language': All(str, Length(max=128)),
         'article_id': Any(int, None),
-        'title': All(str, Range(min=1, max=128)),
+        'title': All(str, Length(min=1, max=128)),
         'contents': All(str, Length(max=1000000000)),
     }
 )
@@ -57,7 +57,7 @@ def create_wiki_article(
     title: str, contents: str, language: str = None, article_id: int = None
 ):
     if language and WikiArticle.is_valid(article_id):
-        language_id = WikiLanguage.from_language(language, error=True)
+        language_id = WikiLanguage.from_language(language, error=True).id
         wiki = WikiTranslation.new(
             article_id=article_id,
             title=title,
@@ -74,7 +74,7 @@ def create_wiki_article(
 
 EDIT_ARTICLE_SCHEMA = Schema(
     {
-        'title': All(str, Range(min=1, max=128)),
+        'title': All(str, Length(min=1, max=128)),
         'language': All(str, Length(max=128)),
         'contents': All(str, Length(max=1000000000)),
     }
@@ -86,14 +86,14 @@ EDIT_ARTICLE_SCHEMA = Schema(
 @validate_data(EDIT_ARTICLE_SCHEMA)
 def edit_wiki_article(id: int, title: str, language: str, contents: str):
     wiki = WikiArticle.from_pk(id, _404=True)
-    if not wiki:
-        raise APIException(f'WikiArticle {id} does not exist.')
-    language_id = WikiLanguage.from_language(language, error=True)
-    wiki = WikiRevision.new(
-        article_id=id,
-        title=title,
-        language_id=language_id,
-        editor_id=flask.g.user.id,
-        contents=contents,
-    )
-    return wiki
+    language_id = WikiLanguage.from_language(language, error=True).id
+    if language_id != 1:
+        wiki = WikiTranslation.from_attrs(
+            article_id=id, language_id=language_id
+        )
+        if not wiki:
+            raise APIException(
+                f'WikiArticle {id} has no {language} translation.', 404
+            )
+    wiki.edit(title=title, contents=contents, editor_id=flask.g.user.id)
+    return flask.jsonify(wiki)
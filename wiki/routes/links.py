@@ -0,0 +1,41 @@
+import flask
+from voluptuous import All, Coerce, Range, Schema
+
+from core.utils import require_permission, validate_data
+from wiki.models import WikiArticle, WikiLink
+from wiki.permissions import WikiPermissions
+from wiki.replica import read_replica
+
+from . import bp
+
+PAGINATION_SCHEMA = Schema(
+    {
+        'page': All(Coerce(int), Range(min=1, max=2147483648)),
+        'limit': All(Coerce(int), Range(min=1, max=100)),
+    }
+)
+
+
+@bp.route('/wiki/articles/<int:id>/backlinks', methods=['GET'])
+@require_permission(WikiPermissions.VIEW)
+@validate_data(PAGINATION_SCHEMA)
+@read_replica
+def view_wiki_backlinks(id: int, page: int = 1, limit: int = 50):
+    WikiArticle.from_pk(id, _404=True)
+    return flask.jsonify(WikiLink.backlinks(id, page=page, limit=limit))
+
+
+@bp.route('/wiki/links/broken', methods=['GET'])
+@require_permission(WikiPermissions.VIEW)
+@validate_data(PAGINATION_SCHEMA)
+@read_replica
+def view_broken_wiki_links(page: int = 1, limit: int = 50):
+    return flask.jsonify(WikiLink.get_broken(page=page, limit=limit))
+
+
+@bp.route('/wiki/articles/orphans', methods=['GET'])
+@require_permission(WikiPermissions.VIEW)
+@validate_data(PAGINATION_SCHEMA)
+@read_replica
+def view_orphaned_wiki_articles(page: int = 1, limit: int = 50):
+    return flask.jsonify(WikiArticle.get_orphans(page=page, limit=limit))
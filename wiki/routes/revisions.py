@@ -0,0 +1,90 @@
+from typing import Optional
+
+import flask
+from voluptuous import All, Coerce, Length, Range, Schema
+
+from core import APIException
+from core.utils import require_permission, validate_data
+from wiki.models import (
+    WikiArticle,
+    WikiLanguage,
+    WikiRevision,
+    WikiTranslation,
+)
+from wiki.permissions import WikiPermissions
+from wiki.replica import read_replica
+from wiki.responses import negotiated_response
+
+from . import bp
+
+
+def viewable_language_id(id: int, language: Optional[str]) -> int:
+    """
+    Get the id of the requested language of an article, raising a 404 if the article
+    or its translation is deleted and the user may not view deleted articles.
+    """
+    include_dead = flask.g.user.has_permission(WikiPermissions.VIEW_DELETED)
+    WikiArticle.from_pk(id, _404=True, include_dead=include_dead)
+    if not language:
+        return 1
+    language_id = WikiLanguage.from_language(language, error=True).id
+    if language_id != 1:
+        translation = WikiTranslation.from_attrs(
+            article_id=id, language_id=language_id
+        )
+        if not translation or (translation.deleted and not include_dead):
+            raise APIException(
+                f'WikiArticle {id} has no {language} translation.', 404
+            )
+    return language_id
+
+
+VIEW_REVISIONS_SCHEMA = Schema(
+    {
+        'language': All(str, Length(max=128)),
+        'page': All(Coerce(int), Range(min=1, max=2147483648)),
+        'limit': All(Coerce(int), Range(min=1, max=100)),
+    }
+)
+
+
+@bp.route('/wiki/articles/<int:id>/revisions', methods=['GET'])
+@require_permission(WikiPermissions.VIEW)
+@validate_data(VIEW_REVISIONS_SCHEMA)
+@read_replica
+def view_wiki_revisions(
+    id: int, language: str = None, page: int = 1, limit: int = 50
+):
+    language_id = viewable_language_id(id, language)
+    return negotiated_response(
+        WikiRevision.from_article(
+            article_id=id, language_id=language_id, page=page, limit=limit
+        )
+    )
+
+
+VIEW_REVISION_SCHEMA = Schema({'language': All(str, Length(max=128))})
+
+
+@bp.route(
+    '/wiki/articles/<int:id>/revisions/<int:revision_id>', methods=['GET']
+)
+@require_permission(WikiPermissions.VIEW)
+@validate_data(VIEW_REVISION_SCHEMA)
+@read_replica
+def view_wiki_revision(id: int, revision_id: int, language: str = None):
+    language_id = viewable_language_id(id, language)
+    revision = WikiRevision.from_attrs(
+        revision_id=revision_id, article_id=id, language_id=language_id
+    )
+    if not revision:
+        raise APIException(
+            f'WikiRevision {revision_id} of article {id} does not exist.', 404
+        )
+    # Revisions are never modified once created, so their payloads can be cached.
+    return negotiated_response(
+        revision,
+        cache_key=WikiRevision.__cache_key_payload__.format(
+            article_id=id, language_id=language_id, revision_id=revision_id
+        ),
+    )
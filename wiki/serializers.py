@@ -31,3 +31,14 @@ class WikiTranslationSerializer(Serializer):
 class WikiLanguageSerializer(Serializer):
     id = Attribute()
     language = Attribute()
+
+
+class WikiAliasSerializer(Serializer):
+    alias = Attribute()
+    article_id = Attribute()
+
+
+class WikiLinkSerializer(Serializer):
+    article_id = Attribute()
+    language_id = Attribute()
+    target = Attribute()
@@ -10,9 +10,9 @@ class WikiPopulator(TestDataPopulator):
             """
             INSERT INTO wiki_articles (title, contents, deleted) VALUES
             ('Wiki1', 'Contents1', 'f'),
-            ('Wiki2', 'Contents2', 'f'),
+            ('Wiki2', 'Contents2 [[Wiki 1]] [[Missing]]', 'f'),
             ('Wiki3', 'Contents3', 'f'),
-            ('Wiki4', 'Contents4', 't')
+            ('Wiki4', 'Contents4 [[Wiki3]]', 't')
             """
         )
         db.session.execute(
@@ -26,8 +26,8 @@ class WikiPopulator(TestDataPopulator):
                 (article_id, language_id, title, contents, deleted) VALUES
             (1, 2, 'WikiUno', 'ContentosUno', 'f'),
             (1, 3, 'Diddles1', 'Dontentos1', 'f'),
-            (2, 2, 'WikiDos', 'ContentosDos', 'f'),
-            (2, 3, 'Diddles2', 'Dontentos2', 't')
+            (2, 2, 'WikiDos', 'ContentosDos [[WikiUno|uno]]', 'f'),
+            (2, 3, 'Diddles2', 'Dontentos2 [[Nowhere]]', 't')
             """
         )
         db.session.execute(
@@ -59,6 +59,16 @@ class WikiPopulator(TestDataPopulator):
             ('wikione', 1)
             """
         )
+        db.session.execute(
+            """
+            INSERT INTO wiki_links (article_id, language_id, target) VALUES
+            (2, 1, 'wiki1'),
+            (2, 1, 'missing'),
+            (2, 2, 'wikiuno'),
+            (2, 3, 'nowhere'),
+            (4, 1, 'wiki3')
+            """
+        )
         cls.add_permissions(
             WikiPermissions.VIEW,
             WikiPermissions.EDIT,
@@ -69,6 +79,7 @@ class WikiPopulator(TestDataPopulator):
 
     @classmethod
     def unpopulate(cls):
+        db.engine.execute('DELETE FROM wiki_links')
         db.engine.execute('DELETE FROM wiki_aliases')
         db.engine.execute('DELETE FROM wiki_revisions')
         db.engine.execute('DELETE FROM wiki_translations')